@@ -1,17 +1,46 @@
 #!/usr/bin/env python3
 import argparse
+import ctypes
+import ctypes.util
 import datetime as dt
+import errno
+import functools
+import hashlib
+import hmac
+import importlib.util
 import json
 import os
 import re
 import shutil
 import sys
-import tempfile
+import threading
 import time
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from pathlib import Path
 
-from huggingface_hub import HfApi, snapshot_download
+# huggingface_hub 在导入时读取这些开关，必须先于导入设置。
+# 开启 hf_transfer 后 snapshot_download 会逐个文件下载，因此需显式开启。
+if (
+    os.getenv("SYNC_HF_TRANSFER", "").strip().lower() in ("1", "true", "yes", "on")
+    and importlib.util.find_spec("hf_transfer") is not None
+):
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+os.environ.setdefault("HF_XET_HIGH_PERFORMANCE", "1")
+
+from huggingface_hub import (
+    HfApi,
+    _snapshot_download,
+    file_download,
+    snapshot_download,
+)
+from huggingface_hub.hf_api import SpaceInfo
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 def parse_tokens(raw: str):
@@ -34,6 +63,18 @@ def parse_name_list(raw: str | None):
     return set(parse_tokens(raw))
 
 
+def json_loads(raw: str | bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def json_dumps_bytes(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
 def get_env_int(name: str, default: int) -> int:
     value = os.getenv(name)
     if value is None or value == "":
@@ -54,6 +95,13 @@ def get_env_float(name: str, default: float) -> float:
         return default
 
 
+def get_env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 def load_accounts(raw: str):
     if not raw:
         raise ValueError(
@@ -63,7 +111,7 @@ def load_accounts(raw: str):
     raw = raw.strip()
     accounts = None
     if raw.startswith("{") or raw.startswith("["):
-        data = json.loads(raw)
+        data = json_loads(raw)
         if isinstance(data, dict) and "accounts" in data:
             accounts = data["accounts"]
         else:
@@ -106,22 +154,70 @@ def load_accounts(raw: str):
     return normalized
 
 
+UNSAFE_COMPONENT_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+@functools.lru_cache(maxsize=4096)
 def safe_component(value: str) -> str:
-    cleaned = re.sub(r"[^A-Za-z0-9._-]+", "_", value.strip())
+    cleaned = UNSAFE_COMPONENT_RE.sub("_", value.strip())
     cleaned = cleaned.strip("._-")
     return cleaned or "unknown"
 
 
-def resolve_account(api: HfApi, entry: dict, retries: int, retry_delay: float):
+@functools.lru_cache(maxsize=None)
+def lookup_whoami_name(api: HfApi, token: str) -> str | None:
+    whoami = api.whoami(token=token)
+    return whoami.get("name") or whoami.get("user")
+
+
+def assign_cache_keys(accounts: list):
+    # 以全部 token 派生 HMAC 密钥，提交到仓库的 meta.json 无法用于校验单个 token。
+    secret = hashlib.sha256("\n".join(sorted(entry["token"] for entry in accounts)).encode("utf-8")).digest()
+    for entry in accounts:
+        entry["cache_key"] = hmac.new(secret, entry["token"].encode("utf-8"), hashlib.sha256).hexdigest()[:16]
+
+
+def is_cache_fresh(cached_at: str | None, ttl: float) -> bool:
+    if not cached_at:
+        return False
+    try:
+        cached = dt.datetime.strptime(cached_at, "%Y-%m-%d %H:%M:%S UTC")
+    except ValueError:
+        return False
+    age = time.time() - cached.replace(tzinfo=dt.timezone.utc).timestamp()
+    return 0 <= age < ttl
+
+
+def resolve_account(
+    api: HfApi,
+    entry: dict,
+    retries: int,
+    retry_delay: float,
+    resolved_cache: dict,
+    cache_ttl: float,
+):
     whoami_name = None
     if not entry["username"] or not entry["folder"]:
-        whoami = with_retries(
-            lambda: api.whoami(token=entry["token"]),
-            retries,
-            retry_delay,
-            "获取账号信息",
-        )
-        whoami_name = whoami.get("name") or whoami.get("user")
+        cache_key = entry["cache_key"]
+        cached = resolved_cache.get(cache_key)
+        if (
+            isinstance(cached, dict)
+            and cached.get("username")
+            and is_cache_fresh(cached.get("cached_at"), cache_ttl)
+        ):
+            whoami_name = cached["username"]
+        else:
+            whoami_name = with_retries(
+                lambda: lookup_whoami_name(api, entry["token"]),
+                retries,
+                retry_delay,
+                "获取账号信息",
+            )
+            if whoami_name:
+                resolved_cache[cache_key] = {
+                    "username": whoami_name,
+                    "cached_at": format_utc_now(),
+                }
 
     author = entry["username"] or whoami_name
     if not author:
@@ -131,24 +227,177 @@ def resolve_account(api: HfApi, entry: dict, retries: int, retry_delay: float):
     return author, safe_component(folder)
 
 
-def sync_space(token: str, space_id: str, target_dir: Path, retries: int, retry_delay: float):
-    with tempfile.TemporaryDirectory() as tmp_base:
-        tmp_dir = Path(tmp_base) / "space"
+def disable_hf_transfer():
+    os.environ["HF_HUB_ENABLE_HF_TRANSFER"] = "0"
+    file_download.HF_HUB_ENABLE_HF_TRANSFER = False
+    _snapshot_download.HF_HUB_ENABLE_HF_TRANSFER = False
+
+
+def download_snapshot(**kwargs):
+    try:
+        return snapshot_download(**kwargs)
+    except (ImportError, RuntimeError, ValueError) as exc:
+        if not file_download.HF_HUB_ENABLE_HF_TRANSFER or "hf_transfer" not in str(exc):
+            raise
+        print(
+            f"hf_transfer 下载失败，改用普通下载: {normalize_error(exc)}",
+            file=sys.stderr,
+        )
+        disable_hf_transfer()
+        return snapshot_download(**kwargs)
+
+
+def sync_space(
+    api: HfApi,
+    token: str,
+    space_id: str,
+    target_dir: Path,
+    retries: int,
+    retry_delay: float,
+    file_workers: int,
+    force: bool,
+    cleanup_executor: ThreadPoolExecutor,
+    prev_sha: str | None,
+) -> tuple[bool, SpaceInfo | None]:
+    if force:
+        sync_space_clean(
+            token, space_id, target_dir, retries, retry_delay, file_workers, cleanup_executor
+        )
+        return True, None
+
+    info = with_retries(
+        lambda: api.space_info(space_id, files_metadata=True, token=token),
+        retries,
+        retry_delay,
+        f"获取 {space_id} 信息",
+    )
+    if info.sha and info.sha == prev_sha and target_dir.exists():
+        return False, info
+
+    sync_space_clean(
+        token,
+        space_id,
+        target_dir,
+        retries,
+        retry_delay,
+        file_workers,
+        cleanup_executor,
+        info.sha,
+    )
+    return True, info
+
+
+def sync_space_clean(
+    token: str,
+    space_id: str,
+    target_dir: Path,
+    retries: int,
+    retry_delay: float,
+    file_workers: int,
+    cleanup_executor: ThreadPoolExecutor | None = None,
+    revision: str | None = None,
+):
+    staging_dir = target_dir.with_name(f"{target_dir.name}.new")
+    staging_str = os.fspath(staging_dir)
+    remove_tree(staging_dir)
+    try:
         with_retries(
-            lambda: snapshot_download(
+            lambda: download_snapshot(
                 repo_id=space_id,
                 repo_type="space",
-                local_dir=str(tmp_dir),
-                local_dir_use_symlinks=False,
+                revision=revision,
+                local_dir=staging_str,
                 token=token,
+                max_workers=file_workers,
             ),
             retries,
             retry_delay,
             f"下载 {space_id}",
         )
+        replace_dir_atomic(staging_dir, target_dir, cleanup_executor)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
 
-        target_dir.parent.mkdir(parents=True, exist_ok=True)
-        replace_dir_atomic(tmp_dir, target_dir)
+
+def sync_space_task(
+    api: HfApi,
+    token: str,
+    author: str,
+    space_id: str,
+    target_dir: Path,
+    space_info: dict,
+    prev_meta: dict | None,
+    retries: int,
+    retry_delay: float,
+    file_workers: int,
+    force: bool,
+    cleanup_executor: ThreadPoolExecutor,
+    stats_executor: ThreadPoolExecutor,
+) -> tuple[dict, dict | None]:
+    sync_start = time.perf_counter()
+    try:
+        downloaded, info = sync_space(
+            api,
+            token,
+            space_id,
+            target_dir,
+            retries,
+            retry_delay,
+            file_workers,
+            force,
+            cleanup_executor,
+            (prev_meta or {}).get("sha"),
+        )
+        sync_seconds = time.perf_counter() - sync_start
+        if info is not None and info.sha and not space_info.get("sha"):
+            space_info = {**space_info, "sha": info.sha}
+        repo_stats = repo_file_stats(info) if info is not None else None
+        file_count, size_bytes = repo_stats or collect_dir_stats(target_dir, stats_executor)
+        if downloaded:
+            changed = compute_change(
+                prev_meta,
+                space_info.get("sha"),
+                space_info.get("last_modified"),
+                file_count,
+                size_bytes,
+            )
+        else:
+            changed = "无变化（未下载）"
+        record = {
+            "account": author,
+            "space_id": space_id,
+            "status": "success",
+            "target_dir": target_dir,
+            "sync_seconds": sync_seconds,
+            "file_count": file_count,
+            "size_bytes": size_bytes,
+            "changed": changed,
+            **space_info,
+        }
+        space_meta = None
+        if downloaded:
+            space_meta = {
+                "space_id": space_id,
+                "sha": space_info.get("sha"),
+                "last_modified": space_info.get("last_modified"),
+                "file_count": file_count,
+                "size_bytes": size_bytes,
+                "synced_at": format_utc_now(),
+            }
+    except Exception as exc:
+        sync_seconds = time.perf_counter() - sync_start
+        record = {
+            "account": author,
+            "space_id": space_id,
+            "status": "failed",
+            "error": normalize_error(exc),
+            "target_dir": target_dir,
+            "sync_seconds": sync_seconds,
+            **space_info,
+        }
+        space_meta = None
+    return record, space_meta
 
 
 def format_link(target_dir: Path, report_dir: Path) -> str:
@@ -157,7 +406,10 @@ def format_link(target_dir: Path, report_dir: Path) -> str:
 
 
 def normalize_error(message: str) -> str:
-    text = " ".join(str(message).splitlines()).strip()
+    text = str(message)
+    if "\n" in text or "\r" in text:
+        text = " ".join(text.splitlines())
+    text = text.strip()
     if len(text) > 160:
         return text[:157] + "..."
     return text
@@ -169,18 +421,28 @@ def format_duration(seconds: float | None) -> str:
     return f"{seconds:.1f}s"
 
 
+BYTE_UNITS = (
+    (1024**5, "PB"),
+    (1024**4, "TB"),
+    (1024**3, "GB"),
+    (1024**2, "MB"),
+)
+
+
+@functools.lru_cache(maxsize=1024)
 def format_bytes(size: int | None) -> str:
     if size is None:
         return "-"
     if size < 1024:
         return f"{size} B"
-    units = ["KB", "MB", "GB", "TB"]
-    value = float(size)
-    for unit in units:
-        value /= 1024.0
-        if value < 1024.0:
-            return f"{value:.1f} {unit}"
-    return f"{value:.1f} PB"
+    for threshold, unit in BYTE_UNITS:
+        if size >= threshold:
+            return f"{size / threshold:.1f} {unit}"
+    return f"{size / 1024:.1f} KB"
+
+
+def format_utc_now() -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime())
 
 
 def format_timestamp(value) -> str | None:
@@ -194,37 +456,147 @@ def format_timestamp(value) -> str | None:
     return text or None
 
 
-def collect_dir_stats(path: Path) -> tuple[int, int]:
+def repo_file_stats(info: SpaceInfo) -> tuple[int, int] | None:
+    siblings = info.siblings
+    if siblings is None:
+        return None
+    total_size = 0
+    for sibling in siblings:
+        if sibling.size is None:
+            return None
+        total_size += sibling.size
+    return len(siblings), total_size
+
+
+def walk_dir_stats(path: str, top_dirs: list | None = None) -> tuple[int, int]:
     file_count = 0
     total_size = 0
-    for root, _, files in os.walk(path):
-        for name in files:
-            file_count += 1
-            file_path = Path(root) / name
-            try:
-                total_size += file_path.stat().st_size
-            except OSError:
-                continue
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if top_dirs is not None and current is path:
+                            top_dirs.append(entry)
+                        else:
+                            stack.append(entry.path)
+                        continue
+                    file_count += 1
+                    total_size += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
     return file_count, total_size
 
 
-def replace_dir_atomic(source_dir: Path, target_dir: Path):
+def collect_dir_stats(path: Path, stats_executor: ThreadPoolExecutor | None = None) -> tuple[int, int]:
+    top_dirs = []
+    file_count, total_size = walk_dir_stats(os.fspath(path), top_dirs)
+    subdirs = [entry.path for entry in top_dirs if entry.name != ".huggingface"]
+    if stats_executor is None or len(subdirs) < 2:
+        results = map(walk_dir_stats, subdirs)
+    else:
+        results = stats_executor.map(walk_dir_stats, subdirs)
+    for count, size in results:
+        file_count += count
+        total_size += size
+    return file_count, total_size
+
+
+def remove_tree(path: Path):
+    try:
+        shutil.rmtree(path)
+    except FileNotFoundError:
+        pass
+
+
+def move_dir(source_dir: Path, target_dir: Path):
+    try:
+        os.replace(source_dir, target_dir)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        shutil.move(os.fspath(source_dir), os.fspath(target_dir))
+
+
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+
+
+@functools.lru_cache(maxsize=None)
+def load_renameat2():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    func = getattr(libc, "renameat2", None)
+    if func is None:
+        return None
+    func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    func.restype = ctypes.c_int
+    return func
+
+
+def exchange_dirs(first: Path, second: Path) -> bool:
+    renameat2 = load_renameat2()
+    if renameat2 is None:
+        return False
+    if renameat2(AT_FDCWD, os.fsencode(first), AT_FDCWD, os.fsencode(second), RENAME_EXCHANGE) == 0:
+        return True
+    err = ctypes.get_errno()
+    if err in (errno.ENOSYS, errno.EINVAL, errno.EXDEV, errno.ENOENT):
+        return False
+    raise OSError(err, os.strerror(err), os.fspath(first), None, os.fspath(second))
+
+
+def replace_dir_atomic(
+    source_dir: Path,
+    target_dir: Path,
+    cleanup_executor: ThreadPoolExecutor | None = None,
+):
+    if exchange_dirs(source_dir, target_dir):
+        if cleanup_executor is None:
+            remove_tree(source_dir)
+        else:
+            cleanup_executor.submit(shutil.rmtree, source_dir, ignore_errors=True)
+        return
     backup_dir = target_dir.with_name(f"{target_dir.name}.bak")
-    if backup_dir.exists():
-        shutil.rmtree(backup_dir)
-    if target_dir.exists():
-        shutil.move(str(target_dir), str(backup_dir))
+    remove_tree(backup_dir)
+    try:
+        os.replace(target_dir, backup_dir)
+    except FileNotFoundError:
+        has_backup = False
+    else:
+        has_backup = True
     try:
-        shutil.move(str(source_dir), str(target_dir))
+        move_dir(source_dir, target_dir)
     except Exception:
-        if target_dir.exists():
-            shutil.rmtree(target_dir)
-        if backup_dir.exists():
-            shutil.move(str(backup_dir), str(target_dir))
+        if has_backup:
+            remove_tree(target_dir)
+            os.replace(backup_dir, target_dir)
         raise
     else:
-        if backup_dir.exists():
-            shutil.rmtree(backup_dir)
+        if has_backup:
+            if cleanup_executor is None:
+                remove_tree(backup_dir)
+            else:
+                cleanup_executor.submit(shutil.rmtree, backup_dir, ignore_errors=True)
+
+
+def wait_before_retry(exc: Exception, attempt: int, retries: int, delay: float, label: str):
+    wait = delay * (2 ** (attempt - 1))
+    print(
+        f"{label} 失败，{wait:.1f}s 后重试（{attempt}/{retries}）: {normalize_error(exc)}",
+        file=sys.stderr,
+    )
+    time.sleep(wait)
 
 
 def with_retries(action, retries: int, delay: float, label: str):
@@ -236,32 +608,56 @@ def with_retries(action, retries: int, delay: float, label: str):
             attempt += 1
             if attempt > retries:
                 raise
-            wait = delay * (2 ** (attempt - 1))
-            print(
-                f"{label} 失败，{wait:.1f}s 后重试（{attempt}/{retries}）: {normalize_error(exc)}",
-                file=sys.stderr,
-            )
-            time.sleep(wait)
+            wait_before_retry(exc, attempt, retries, delay, label)
+
+
+def iter_spaces(api: HfApi, author: str, token: str, retries: int, delay: float):
+    seen = set()
+    attempt = 0
+    while True:
+        try:
+            for space in api.list_spaces(author=author, full=True, token=token):
+                if space.id in seen:
+                    continue
+                seen.add(space.id)
+                yield space
+            return
+        except Exception as exc:
+            attempt += 1
+            if attempt > retries:
+                raise
+            wait_before_retry(exc, attempt, retries, delay, "获取 Space 列表")
 
 
 def load_meta(meta_path: Path) -> dict:
     if not meta_path.exists():
-        return {"accounts": {}}
+        return {"accounts": {}, "resolved": {}}
     try:
-        data = json.loads(meta_path.read_text(encoding="utf-8"))
+        data = json_loads(meta_path.read_bytes())
     except Exception:
-        return {"accounts": {}}
+        return {"accounts": {}, "resolved": {}}
     if not isinstance(data, dict):
-        return {"accounts": {}}
+        return {"accounts": {}, "resolved": {}}
     accounts = data.get("accounts")
     if not isinstance(accounts, dict):
         accounts = {}
-    return {"accounts": accounts}
+    resolved = data.get("resolved")
+    if not isinstance(resolved, dict):
+        resolved = {}
+    return {"accounts": accounts, "resolved": resolved}
 
 
 def save_meta(meta_path: Path, data: dict):
+    payload = json_dumps_bytes(data)
+    try:
+        if meta_path.read_bytes() == payload:
+            return
+    except FileNotFoundError:
+        pass
     meta_path.parent.mkdir(parents=True, exist_ok=True)
-    meta_path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    tmp_path = meta_path.with_name(f"{meta_path.name}.tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, meta_path)
 
 
 def extract_space_info(space) -> dict:
@@ -324,136 +720,158 @@ def write_report(
     retries: int,
     retry_delay: float,
     space_sleep: float,
+    max_workers: int,
+    file_workers: int,
+    force: bool,
     run_seconds: float,
 ):
     report_path.parent.mkdir(parents=True, exist_ok=True)
 
     total = len(records)
-    success_count = sum(1 for r in records if r["status"] == "success")
-    empty_count = sum(1 for r in records if r["status"] == "empty")
-    skipped_count = sum(1 for r in records if r["status"] == "skipped")
-    failure_count = sum(1 for r in records if r["status"] == "failed")
+    status_counts = Counter()
+    account_groups = defaultdict(list)
+    account_counts = defaultdict(Counter)
+    for record in records:
+        account = record["account"]
+        status = record["status"]
+        status_counts[status] += 1
+        account_counts[account][status] += 1
+        space_id = record.get("space_id") or "-"
+        if space_id == "-":
+            sort_key = (0, "-")
+            space_name = space_id
+        else:
+            sort_key = (1, space_id.lower())
+            space_name = space_id.split("/", 1)[1] if "/" in space_id else space_id
+        account_groups[account].append((sort_key, space_id, space_name, record))
+    success_count = status_counts["success"]
+    empty_count = status_counts["empty"]
+    skipped_count = status_counts["skipped"]
+    failure_count = status_counts["failed"]
 
-    timestamp = dt.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+    timestamp = format_utc_now()
 
     report_dir = report_path.parent
-    account_groups = defaultdict(list)
-    for record in records:
-        account_groups[record["account"]].append(record)
 
     accounts_sorted = sorted(account_groups.keys(), key=lambda name: name.lower())
 
-    def record_sort_key(record: dict):
-        space_id = record.get("space_id") or ""
-        is_summary = space_id in ("", "-")
-        return (0 if is_summary else 1, space_id.lower())
-
-    def format_space_name(space_id: str) -> str:
-        if "/" in space_id:
-            return space_id.split("/", 1)[1]
-        return space_id
+    root_posix = root_dir.as_posix()
+    root_prefix = f"{root_posix}/"
+    root_link = format_link(root_dir, report_dir)
 
     def format_target_link(target_dir: Path | None):
         if not target_dir:
             return "-", False
         if target_dir.exists():
-            link_path = format_link(target_dir, report_dir)
-            link_label = target_dir.as_posix()
-            return f"[{link_label}]({link_path})", True
+            target_posix = target_dir.as_posix()
+            if target_posix.startswith(root_prefix):
+                rel_target = target_posix[len(root_prefix):]
+                link_path = rel_target if root_link == "." else f"{root_link}/{rel_target}"
+            else:
+                link_path = format_link(target_dir, report_dir)
+            return f"[{target_posix}]({link_path})", True
         return "-", False
 
-    lines = []
-    lines.append("# 同步报告")
-    lines.append("")
-    lines.append(f"- 生成时间: {timestamp}")
-    lines.append(f"- 根目录: `{root_dir.as_posix()}`")
-    lines.append(f"- 账号数: {len(accounts_sorted)}")
-    lines.append(
-        f"- 记录数: {total} | 成功: {success_count} | 空: {empty_count} | 跳过: {skipped_count} | 失败: {failure_count}"
-    )
-    lines.append(f"- 运行耗时: {format_duration(run_seconds)}")
-    if include_filters:
-        lines.append(f"- 仅同步: {', '.join(sorted(include_filters))}")
-    if exclude_filters:
-        lines.append(f"- 排除: {', '.join(sorted(exclude_filters))}")
-    lines.append(
-        f"- 重试策略: {retries} 次 | 初始间隔: {retry_delay:.1f}s | 单空间间隔: {space_sleep:.1f}s"
-    )
-    lines.append("- 说明: 同步目录为本仓库路径，点击可直接跳转。")
-    lines.append("")
-    lines.append("## 账号总览")
-    lines.append("")
-    lines.append("| 账号 | 记录数 | 成功 | 无 Space | 跳过 | 失败 |")
-    lines.append("| --- | --- | --- | --- | --- | --- |")
-    for account in accounts_sorted:
-        group = account_groups[account]
-        group_total = len(group)
-        group_success = sum(1 for r in group if r["status"] == "success")
-        group_empty = sum(1 for r in group if r["status"] == "empty")
-        group_skipped = sum(1 for r in group if r["status"] == "skipped")
-        group_failed = sum(1 for r in group if r["status"] == "failed")
-        lines.append(
-            f"| {account} | {group_total} | {group_success} | {group_empty} | {group_skipped} | {group_failed} |"
+    with report_path.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+        write = fh.write
+        write("# 同步报告\n")
+        write("\n")
+        write(f"- 生成时间: {timestamp}\n")
+        write(f"- 根目录: `{root_posix}`\n")
+        write(f"- 账号数: {len(accounts_sorted)}\n")
+        write(
+            f"- 记录数: {total} | 成功: {success_count} | 空: {empty_count} | 跳过: {skipped_count} | 失败: {failure_count}\n"
+        )
+        write(f"- 运行耗时: {format_duration(run_seconds)}\n")
+        if include_filters:
+            write(f"- 仅同步: {', '.join(sorted(include_filters))}\n")
+        if exclude_filters:
+            write(f"- 排除: {', '.join(sorted(exclude_filters))}\n")
+        write(
+            f"- 重试策略: {retries} 次 | 初始间隔: {retry_delay:.1f}s | 单空间间隔: {space_sleep:.1f}s\n"
+        )
+        if file_download.HF_HUB_ENABLE_HF_TRANSFER:
+            download_mode = "hf_transfer"
+            file_workers = 1
+        else:
+            download_mode = "普通"
+        write(
+            f"- 并发数: {max_workers} | 单 Space 文件并发: {file_workers} | 同步模式: {'全量' if force else '增量'} | 下载方式: {download_mode}\n"
         )
+        write("- 说明: 同步目录为本仓库路径，点击可直接跳转。\n")
+        write("\n")
+        write("## 账号总览\n")
+        write("\n")
+        write("| 账号 | 记录数 | 成功 | 无 Space | 跳过 | 失败 |\n")
+        write("| --- | --- | --- | --- | --- | --- |\n")
+        for account in accounts_sorted:
+            group_total = len(account_groups[account])
+            counts = account_counts[account]
+            write(
+                f"| {account} | {group_total} | {counts['success']} | {counts['empty']} | {counts['skipped']} | {counts['failed']} |\n"
+            )
 
-    for account in accounts_sorted:
-        lines.append("")
-        lines.append(f"## 账号: {account}")
-        lines.append("")
-        lines.append("| Space | 状态 | 同步目录 | 详情 |")
-        lines.append("| --- | --- | --- | --- |")
-        group = sorted(account_groups[account], key=record_sort_key)
-        for record in group:
-            space_id = record.get("space_id") or "-"
-            space_name = format_space_name(space_id)
-            status = record["status"]
-            link_text, link_exists = format_target_link(record.get("target_dir"))
-
-            detail_parts = []
-            if space_id not in ("", "-") and space_name != space_id:
-                detail_parts.append(f"ID: {space_id}")
-            if record.get("changed"):
-                detail_parts.append(f"变更: {record['changed']}")
-            if record.get("last_modified"):
-                detail_parts.append(f"更新时间: {record['last_modified']}")
-            if record.get("sha"):
-                detail_parts.append(f"SHA: {record['sha'][:8]}")
-            if record.get("file_count") is not None:
-                detail_parts.append(f"文件: {record['file_count']}")
-            if record.get("size_bytes") is not None:
-                detail_parts.append(f"大小: {format_bytes(record['size_bytes'])}")
-            if record.get("sync_seconds") is not None:
-                detail_parts.append(f"耗时: {format_duration(record['sync_seconds'])}")
-            if record.get("visibility"):
-                detail_parts.append(f"可见性: {record['visibility']}")
-            if record.get("space_status"):
-                detail_parts.append(f"Space 状态: {record['space_status']}")
-
-            if status == "success":
-                status_text = "成功"
-                detail = "<br>".join(detail_parts) if detail_parts else "-"
-            elif status == "empty":
-                status_text = "无 Space"
-                detail = "该账号暂无 Space"
-            elif status == "skipped":
-                status_text = "跳过"
-                reason = record.get("skip_reason") or "已跳过"
-                detail_parts.insert(0, reason)
-                detail = "<br>".join(detail_parts) if detail_parts else reason
-            else:
-                status_text = "失败"
-                error = normalize_error(record.get("error") or "未知错误")
-                if link_exists:
-                    detail_parts.insert(0, f"错误: {error}")
-                    detail_parts.append("目录可能为上次同步内容")
-                    detail = "<br>".join(detail_parts)
+        for account in accounts_sorted:
+            write("\n")
+            write(f"## 账号: {account}\n")
+            write("\n")
+            write("| Space | 状态 | 同步目录 | 详情 |\n")
+            write("| --- | --- | --- | --- |\n")
+            group = account_groups[account]
+            group.sort(key=itemgetter(0))
+            for _, space_id, space_name, record in group:
+                get = record.get
+                status = record["status"]
+                link_text, link_exists = format_target_link(get("target_dir"))
+
+                detail_parts = []
+                if space_name != space_id:
+                    detail_parts.append(f"ID: {space_id}")
+                changed = get("changed")
+                if changed:
+                    detail_parts.append(f"变更: {changed}")
+                last_modified = get("last_modified")
+                if last_modified:
+                    detail_parts.append(f"更新时间: {last_modified}")
+                sha = get("sha")
+                if sha:
+                    detail_parts.append(f"SHA: {sha[:8]}")
+                file_count = get("file_count")
+                if file_count is not None:
+                    detail_parts.append(f"文件: {file_count}")
+                size_bytes = get("size_bytes")
+                if size_bytes is not None:
+                    detail_parts.append(f"大小: {format_bytes(size_bytes)}")
+                sync_seconds = get("sync_seconds")
+                if sync_seconds is not None:
+                    detail_parts.append(f"耗时: {format_duration(sync_seconds)}")
+                visibility = get("visibility")
+                if visibility:
+                    detail_parts.append(f"可见性: {visibility}")
+                space_status = get("space_status")
+                if space_status:
+                    detail_parts.append(f"Space 状态: {space_status}")
+
+                if status == "success":
+                    status_text = "成功"
+                    detail = "<br>".join(detail_parts) if detail_parts else "-"
+                elif status == "empty":
+                    status_text = "无 Space"
+                    detail = "该账号暂无 Space"
+                elif status == "skipped":
+                    status_text = "跳过"
+                    reason = get("skip_reason") or "已跳过"
+                    detail_parts.insert(0, reason)
+                    detail = "<br>".join(detail_parts) if detail_parts else reason
                 else:
+                    status_text = "失败"
+                    error = normalize_error(get("error") or "未知错误")
                     detail_parts.insert(0, f"错误: {error}")
+                    if link_exists:
+                        detail_parts.append("目录可能为上次同步内容")
                     detail = "<br>".join(detail_parts)
 
-            lines.append(f"| {space_name} | {status_text} | {link_text} | {detail} |")
-
-    report_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+                write(f"| {space_name} | {status_text} | {link_text} | {detail} |\n")
 
 
 def main():
@@ -461,6 +879,9 @@ def main():
     default_retries = get_env_int("SYNC_RETRIES", 2)
     default_retry_delay = get_env_float("SYNC_RETRY_DELAY", 2.0)
     default_space_sleep = get_env_float("SYNC_SPACE_SLEEP", 0.0)
+    default_max_workers = get_env_int("SYNC_MAX_WORKERS", 8)
+    default_file_workers = get_env_int("SYNC_FILE_WORKERS", 8)
+    default_meta_ttl = get_env_float("SYNC_META_TTL", 86400.0)
     parser.add_argument(
         "--root",
         default=os.getenv("SYNC_ROOT", "sync"),
@@ -502,7 +923,38 @@ def main():
         "--space-sleep",
         type=float,
         default=default_space_sleep,
-        help="每个 Space 同步后的等待时间（秒）。",
+        help="同一账号内相邻两个 Space 开始同步之间的等待时间（秒）。",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=default_max_workers,
+        help="同时同步的 Space 数量。",
+    )
+    parser.add_argument(
+        "--file-workers",
+        type=int,
+        default=default_file_workers,
+        help="单个 Space 内同时下载的文件数量。",
+    )
+    parser.add_argument(
+        "--meta-ttl",
+        type=float,
+        default=default_meta_ttl,
+        help="账号名缓存的有效期（秒），0 表示不使用缓存。",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        default=get_env_flag("SYNC_FORCE"),
+        help="清空后重新下载每个 Space，不做增量同步。",
+    )
+    parser.add_argument(
+        "--no-report-skipped",
+        dest="report_skipped",
+        action="store_false",
+        default=get_env_flag("SYNC_REPORT_SKIPPED", True),
+        help="报告中不列出被 include/exclude 过滤掉的 Space。",
     )
     args = parser.parse_args()
 
@@ -511,6 +963,9 @@ def main():
     retries = max(0, args.retries)
     retry_delay = max(0.0, args.retry_delay)
     space_sleep = max(0.0, args.space_sleep)
+    max_workers = max(1, args.max_workers)
+    file_workers = max(1, args.file_workers)
+    meta_ttl = max(0.0, args.meta_ttl)
     run_timer = time.perf_counter()
 
     try:
@@ -518,6 +973,7 @@ def main():
     except Exception as exc:
         print(f"配置错误: {exc}", file=sys.stderr)
         return 1
+    assign_cache_keys(accounts)
 
     api = HfApi()
     root_dir = Path(args.root)
@@ -525,12 +981,14 @@ def main():
     meta_path = report_path.parent / "meta.json"
     meta = load_meta(meta_path)
     meta_accounts = meta["accounts"]
+    resolved_cache = meta["resolved"]
     records = []
-
+    resolved = []
     for entry in accounts:
         try:
-            author, folder = resolve_account(api, entry, retries, retry_delay)
-            account_dir = root_dir / folder
+            author, folder = resolve_account(
+                api, entry, retries, retry_delay, resolved_cache, meta_ttl
+            )
         except Exception as exc:
             records.append(
                 {
@@ -541,16 +999,132 @@ def main():
                 }
             )
             continue
-
+        resolved.append((entry, author, root_dir / folder))
+
+    stop_event = threading.Event()
+
+    queued_spaces = {}
+
+    def interrupted_record(author: str, space_id: str, target_dir: Path | None, space_info: dict):
+        return {
+            "account": author,
+            "space_id": space_id,
+            "status": "skipped",
+            "skip_reason": "同步已中断",
+            "target_dir": target_dir if target_dir and target_dir.exists() else None,
+            **space_info,
+        }
+
+    def queue_account(
+        executor: ThreadPoolExecutor,
+        cleanup_executor: ThreadPoolExecutor,
+        stats_executor: ThreadPoolExecutor,
+        entry: dict,
+        author: str,
+        account_dir: Path,
+    ):
+        account_records = []
+        account_futures = []
+        space_count = 0
+        filtered_count = 0
+        account_dir_ready = False
+        listing_interrupted = False
         try:
-            spaces = with_retries(
-                lambda: api.list_spaces(author=author, token=entry["token"]),
-                retries,
-                retry_delay,
-                "获取 Space 列表",
-            )
+            for space in iter_spaces(api, author, entry["token"], retries, retry_delay):
+                if stop_event.is_set():
+                    listing_interrupted = True
+                    break
+                space_count += 1
+                space_id = space.id or ""
+                space_name = space_id.split("/", 1)[1] if "/" in space_id else space_id
+                skip_reason = None
+                if include_filters and not matches_filter(space_id, space_name, include_filters):
+                    skip_reason = "不在同步范围"
+                elif exclude_filters and matches_filter(space_id, space_name, exclude_filters):
+                    skip_reason = "已在排除列表"
+                if skip_reason and not args.report_skipped:
+                    filtered_count += 1
+                    continue
+
+                target_dir = account_dir / safe_component(space_name)
+                space_info = extract_space_info(space)
+
+                if skip_reason:
+                    account_records.append(
+                        {
+                            "account": author,
+                            "space_id": space_id,
+                            "status": "skipped",
+                            "skip_reason": skip_reason,
+                            "target_dir": target_dir if target_dir.exists() else None,
+                            **space_info,
+                        }
+                    )
+                    if space_sleep > 0:
+                        time.sleep(space_sleep)
+                    continue
+
+                prev_meta = meta_accounts.get(author, {}).get(space_id)
+                if (
+                    not args.force
+                    and compute_change(
+                        prev_meta,
+                        space_info.get("sha"),
+                        space_info.get("last_modified"),
+                        None,
+                        None,
+                    )
+                    == "无变化"
+                    and target_dir.exists()
+                ):
+                    account_records.append(
+                        {
+                            "account": author,
+                            "space_id": space_id,
+                            "status": "success",
+                            "target_dir": target_dir,
+                            "file_count": prev_meta.get("file_count"),
+                            "size_bytes": prev_meta.get("size_bytes"),
+                            "changed": "无变化（未下载）",
+                            **space_info,
+                        }
+                    )
+                    continue
+
+                if not account_dir_ready:
+                    account_dir.mkdir(parents=True, exist_ok=True)
+                    account_dir_ready = True
+                try:
+                    future = executor.submit(
+                        sync_space_task,
+                        api,
+                        entry["token"],
+                        author,
+                        space_id,
+                        target_dir,
+                        space_info,
+                        prev_meta,
+                        retries,
+                        retry_delay,
+                        file_workers,
+                        args.force,
+                        cleanup_executor,
+                        stats_executor,
+                    )
+                except RuntimeError:
+                    if not stop_event.is_set():
+                        raise
+                    account_records.append(
+                        interrupted_record(author, space_id, target_dir, space_info)
+                    )
+                    listing_interrupted = True
+                    break
+                queued_spaces[future] = (author, space_id, target_dir, space_info)
+                account_futures.append(future)
+                if space_sleep > 0:
+                    stop_event.wait(space_sleep)
         except Exception as exc:
-            records.append(
+            account_records.append(
                 {
                     "account": author,
                     "status": "failed",
@@ -558,10 +1132,12 @@ def main():
                     "target_dir": None,
                 }
             )
-            continue
+            return account_records, account_futures
 
-        if not spaces:
-            records.append(
+        if listing_interrupted:
+            account_records.append(interrupted_record(author, "-", None, {}))
+        elif space_count == 0:
+            account_records.append(
                 {
                     "account": author,
                     "space_id": "-",
@@ -569,98 +1145,90 @@ def main():
                     "target_dir": None,
                 }
             )
-            continue
-
-        spaces_sorted = sorted(spaces, key=lambda s: (s.id or "").lower())
-        for space in spaces_sorted:
-            space_id = space.id or ""
-            space_name = space_id.split("/", 1)[1] if "/" in space_id else space_id
-            target_dir = account_dir / safe_component(space_name)
-            space_info = extract_space_info(space)
-
-            if include_filters and not matches_filter(space_id, space_name, include_filters):
-                records.append(
-                    {
-                        "account": author,
-                        "space_id": space_id,
-                        "status": "skipped",
-                        "skip_reason": "不在同步范围",
-                        "target_dir": target_dir if target_dir.exists() else None,
-                        **space_info,
-                    }
-                )
-                if space_sleep > 0:
-                    time.sleep(space_sleep)
-                continue
-
-            if exclude_filters and matches_filter(space_id, space_name, exclude_filters):
-                records.append(
-                    {
-                        "account": author,
-                        "space_id": space_id,
-                        "status": "skipped",
-                        "skip_reason": "已在排除列表",
-                        "target_dir": target_dir if target_dir.exists() else None,
-                        **space_info,
-                    }
-                )
-                if space_sleep > 0:
-                    time.sleep(space_sleep)
-                continue
-
-            sync_start = time.perf_counter()
-            try:
-                sync_space(entry["token"], space_id, target_dir, retries, retry_delay)
-                sync_seconds = time.perf_counter() - sync_start
-                file_count, size_bytes = collect_dir_stats(target_dir)
-                prev_meta = meta_accounts.get(author, {}).get(space_id)
-                changed = compute_change(
-                    prev_meta,
-                    space_info.get("sha"),
-                    space_info.get("last_modified"),
-                    file_count,
-                    size_bytes,
-                )
-                records.append(
-                    {
-                        "account": author,
-                        "space_id": space_id,
-                        "status": "success",
-                        "target_dir": target_dir,
-                        "sync_seconds": sync_seconds,
-                        "file_count": file_count,
-                        "size_bytes": size_bytes,
-                        "changed": changed,
-                        **space_info,
-                    }
-                )
-                account_meta = meta_accounts.setdefault(author, {})
-                account_meta[space_id] = {
-                    "space_id": space_id,
-                    "sha": space_info.get("sha"),
-                    "last_modified": space_info.get("last_modified"),
-                    "file_count": file_count,
-                    "size_bytes": size_bytes,
-                    "synced_at": dt.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"),
+        elif not account_records and not account_futures and filtered_count:
+            account_records.append(
+                {
+                    "account": author,
+                    "space_id": "-",
+                    "status": "skipped",
+                    "skip_reason": f"{filtered_count} 个 Space 均被同步范围过滤",
+                    "target_dir": None,
                 }
-            except Exception as exc:
-                sync_seconds = time.perf_counter() - sync_start
-                records.append(
-                    {
-                        "account": author,
-                        "space_id": space_id,
-                        "status": "failed",
-                        "error": normalize_error(exc),
-                        "target_dir": target_dir,
-                        "sync_seconds": sync_seconds,
-                        **space_info,
-                    }
+            )
+        return account_records, account_futures
+
+    def merge_account_result(list_future):
+        account_records, account_futures = list_future.result()
+        records.extend(account_records)
+        pending_syncs.update(account_futures)
+        return account_futures
+
+    def merge_sync_result(future):
+        pending_syncs.discard(future)
+        record, space_meta = future.result()
+        records.append(record)
+        if space_meta:
+            meta_accounts.setdefault(record["account"], {})[record["space_id"]] = space_meta
+
+    list_workers = max(1, min(len(resolved), max_workers))
+    stats_workers = min(32, (os.cpu_count() or 1) * 4)
+    pending_lists = {}
+    pending_syncs = set()
+    interrupted = False
+    with (
+        ThreadPoolExecutor(max_workers=2) as cleanup_executor,
+        ThreadPoolExecutor(max_workers=stats_workers) as stats_executor,
+        ThreadPoolExecutor(max_workers=max_workers) as executor,
+        ThreadPoolExecutor(max_workers=list_workers) as list_executor,
+    ):
+        try:
+            for entry, author, account_dir in resolved:
+                list_future = list_executor.submit(
+                    queue_account,
+                    executor,
+                    cleanup_executor,
+                    stats_executor,
+                    entry,
+                    author,
+                    account_dir,
                 )
-            if space_sleep > 0:
-                time.sleep(space_sleep)
+                pending_lists[list_future] = author
+            futures = []
+            for list_future in as_completed(list(pending_lists)):
+                del pending_lists[list_future]
+                futures.extend(merge_account_result(list_future))
+            for future in as_completed(futures):
+                merge_sync_result(future)
+        except KeyboardInterrupt:
+            interrupted = True
+            stop_event.set()
+            print("收到中断信号，取消尚未开始的同步任务。", file=sys.stderr)
+            list_executor.shutdown(wait=False, cancel_futures=True)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    if interrupted:
+        for list_future, author in pending_lists.items():
+            if list_future.cancelled():
+                records.append(interrupted_record(author, "-", None, {}))
+            else:
+                merge_account_result(list_future)
+        for future in list(pending_syncs):
+            if future.cancelled():
+                pending_syncs.discard(future)
+                records.append(interrupted_record(*queued_spaces[future]))
+            else:
+                merge_sync_result(future)
 
     run_seconds = time.perf_counter() - run_timer
-    save_meta(meta_path, {"accounts": meta_accounts})
+    meta_accounts = {
+        author: dict(sorted(spaces.items(), key=lambda item: item[0].lower()))
+        for author, spaces in sorted(meta_accounts.items(), key=lambda item: item[0].lower())
+    }
+    used_cache_keys = {entry["cache_key"] for entry in accounts}
+    resolved_cache = {
+        key: value for key, value in sorted(resolved_cache.items()) if key in used_cache_keys
+    }
+    save_meta(meta_path, {"accounts": meta_accounts, "resolved": resolved_cache})
     write_report(
         report_path,
         root_dir,
@@ -670,10 +1238,13 @@ def main():
         retries,
         retry_delay,
         space_sleep,
+        max_workers,
+        file_workers,
+        args.force,
         run_seconds,
     )
     print(f"同步报告已写入 {report_path}")
-    return 0
+    return 130 if interrupted else 0
 
 
 if __name__ == "__main__":